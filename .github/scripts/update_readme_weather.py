@@ -1,69 +1,135 @@
 #!/usr/bin/env python3
 import datetime as dt
-import json
+import http.client
 import os
 import re
 import time
-from urllib.request import Request, urlopen
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+try:
+    import orjson as _json  # optional, faster JSON parsing when installed
+except ImportError:
+    import json as _json
 
 START = "<!-- DUBLIN_WEATHER:START -->"
 END = "<!-- DUBLIN_WEATHER:END -->"
 
 KEEP_DAYS = 10
 
+# Runs closer together than this reuse the previous reading instead of fetching.
+MIN_REFRESH_INTERVAL = dt.timedelta(minutes=30)
+
+FETCH_UNAVAILABLE = "⚠️ Weather fetch unavailable."
+
 # Matches:
 # - 2026-02-24 09:00 UTC — Dublin: 🌦 +8°C | Wind ↗15 km/h
 LINE_RE = re.compile(r"^- (\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}) UTC — (.*)$")
 
+# Upper bound on the provider race in fetch_weather (wttr and open-meteo use 6s/8s socket timeouts).
+FETCH_DEADLINE_SEC = 10
 
-def http_get(url: str, timeout: int = 8, retries: int = 2, backoff_sec: float = 1.0) -> str:
+# Both providers answer with well under 1 KB; cap reads so a misbehaving endpoint can't balloon memory.
+MAX_RESPONSE_BYTES = 4096
+
+# Connecting gets a short timeout of its own so an unreachable host fails fast;
+# the caller's timeout then applies to each read.
+CONNECT_TIMEOUT_SEC = 3
+
+# Only these statuses are worth retrying; anything else will not fix itself.
+TRANSIENT_HTTP_STATUSES = frozenset({500, 502, 503, 504})
+
+# One HTTPS connection per host, reused across retries so they skip a fresh TCP + TLS handshake.
+_CONNECTIONS: dict[str, http.client.HTTPSConnection] = {}
+
+
+def http_get_bytes(url: str, timeout: int = 8, retries: int = 2, backoff_sec: float = 1.0) -> bytes:
+    parts = urlsplit(url)
+    host = parts.netloc
+    target = f"{parts.path}?{parts.query}" if parts.query else parts.path
     last_err = None
     for i in range(retries + 1):
+        conn = _CONNECTIONS.get(host)
+        if conn is None:
+            conn = _CONNECTIONS[host] = http.client.HTTPSConnection(host, timeout=CONNECT_TIMEOUT_SEC)
         try:
-            req = Request(url, headers={"User-Agent": "github-actions-weather-bot"})
-            with urlopen(req, timeout=timeout) as r:
-                return r.read().decode("utf-8", errors="replace")
+            if conn.sock is None:
+                conn.connect()
+                conn.sock.settimeout(timeout)
+            conn.request("GET", target, headers={"User-Agent": "github-actions-weather-bot"})
+            r = conn.getresponse()
+            body = r.read(MAX_RESPONSE_BYTES)
+            if not r.isclosed():
+                # Body was larger than the cap; the rest is still on the wire, so the socket can't be reused.
+                conn.close()
+                _CONNECTIONS.pop(host, None)
         except Exception as e:
+            # The socket is in an unknown state; drop it so the next attempt reconnects.
+            conn.close()
+            _CONNECTIONS.pop(host, None)
             last_err = e
-            if i < retries:
-                time.sleep(backoff_sec * (i + 1))
+        else:
+            if r.status == 200:
+                return body
+            last_err = RuntimeError(f"{host} returned HTTP {r.status}")
+            if r.status not in TRANSIENT_HTTP_STATUSES:
+                break
+        if i < retries:
+            time.sleep(backoff_sec * (i + 1))
     raise last_err
 
 
+def http_get(url: str, timeout: int = 8, retries: int = 2, backoff_sec: float = 1.0) -> str:
+    return http_get_bytes(url, timeout, retries, backoff_sec).decode("utf-8", errors="replace")
+
+
+# Include wind so we can reliably detect "windy" and show wind theme when appropriate.
+# %l location, %c icon, %t temperature, %w wind
+WTTR_URL = "https://wttr.in/Dublin?format=%l:+%c+%t+|+Wind+%w"
+
+OPEN_METEO_URL = (
+    "https://api.open-meteo.com/v1/forecast"
+    "?latitude=53.3498&longitude=-6.2603"
+    "&current=temperature_2m,weather_code,wind_speed_10m"
+    "&timezone=UTC"
+)
+
+
 def weather_from_wttr() -> str:
-    # Include wind so we can reliably detect "windy" and show wind theme when appropriate.
-    # %l location, %c icon, %t temperature, %w wind
-    url = "https://wttr.in/Dublin?format=%l:+%c+%t+|+Wind+%w"
-    txt = http_get(url, timeout=6, retries=2).strip()
+    txt = http_get(WTTR_URL, timeout=6, retries=1, backoff_sec=0.5).strip()
     if not txt:
         raise RuntimeError("wttr returned empty response")
     return txt
 
 
+# WMO weather interpretation codes used by open-meteo, as a table indexed by code (0-99).
+_WEATHER_CODES = {
+    0: "Clear", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+    45: "Fog", 48: "Rime fog",
+    51: "Light drizzle", 53: "Drizzle", 55: "Heavy drizzle",
+    61: "Light rain", 63: "Rain", 65: "Heavy rain",
+    71: "Light snow", 73: "Snow", 75: "Heavy snow",
+    80: "Rain showers", 81: "Showers", 82: "Violent showers",
+    95: "Thunderstorm",
+}
+_WEATHER_CODE_TABLE = tuple(_WEATHER_CODES.get(code, "") for code in range(100))
+del _WEATHER_CODES
+
+
 def weather_from_open_meteo() -> str:
-    url = (
-        "https://api.open-meteo.com/v1/forecast"
-        "?latitude=53.3498&longitude=-6.2603"
-        "&current=temperature_2m,weather_code,wind_speed_10m"
-        "&timezone=UTC"
-    )
-    raw = http_get(url, timeout=8, retries=2)
-    data = json.loads(raw)
+    # Both json and orjson parse UTF-8 bytes directly, so skip the str decode.
+    raw = http_get_bytes(OPEN_METEO_URL, timeout=8, retries=1, backoff_sec=0.5)
+    data = _json.loads(raw)
     cur = data.get("current") or {}
     temp = cur.get("temperature_2m")
     wind = cur.get("wind_speed_10m")
     code = cur.get("weather_code")
 
-    code_map = {
-        0: "Clear", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-        45: "Fog", 48: "Rime fog",
-        51: "Light drizzle", 53: "Drizzle", 55: "Heavy drizzle",
-        61: "Light rain", 63: "Rain", 65: "Heavy rain",
-        71: "Light snow", 73: "Snow", 75: "Heavy snow",
-        80: "Rain showers", 81: "Showers", 82: "Violent showers",
-        95: "Thunderstorm",
-    }
-    cond = code_map.get(code, f"Weather code {code}")
+    cond = ""
+    if type(code) is int and 0 <= code < len(_WEATHER_CODE_TABLE):
+        cond = _WEATHER_CODE_TABLE[code]
+    if not cond:
+        cond = f"Weather code {code}"
 
     if temp is None:
         raise RuntimeError("open-meteo missing temperature")
@@ -75,18 +141,36 @@ def weather_from_open_meteo() -> str:
 
 
 def fetch_weather() -> str:
+    # Race both providers and take the first successful answer instead of
+    # waiting for wttr to fail before trying open-meteo. Each provider retries
+    # only transient failures, once; the other one running in parallel covers the rest.
+    ex = ThreadPoolExecutor(max_workers=2)
+    futs = [ex.submit(weather_from_wttr), ex.submit(weather_from_open_meteo)]
+    last_err = None
     try:
-        return weather_from_wttr()
-    except Exception:
-        return weather_from_open_meteo()
+        for fut in as_completed(futs, timeout=FETCH_DEADLINE_SEC):
+            try:
+                return fut.result()
+            except Exception as e:
+                last_err = e
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+    raise RuntimeError("all weather providers failed") from last_err
+
+
+_SVG_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"})
 
 
 def escape_svg_text(s: str) -> str:
-    return (s.replace("&", "&amp;")
-             .replace("<", "&lt;")
-             .replace(">", "&gt;")
-             .replace('"', "&quot;")
-             .replace("'", "&#39;"))
+    return s.translate(_SVG_ESCAPE_TABLE)
+
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    # Write to a sibling temp file and rename over the target so a crash never leaves it half-written.
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
 
 
 def extract_wind_kmh(weather_text: str) -> float | None:
@@ -104,28 +188,33 @@ def extract_wind_kmh(weather_text: str) -> float | None:
         return None
 
 
+# One named group per theme. The zero-width lookahead lets a single finditer
+# report every keyword, including overlapping ones, without lowercasing the text.
+_CLASSIFY_RE = re.compile(
+    r"(?=(?P<thunder>thunder|storm)|(?P<snow>snow|sleet|blizzard)|(?P<rain>rain|drizzle|shower)"
+    r"|(?P<fog>fog|mist|haze)|(?P<wind>wind|breez|gust)|(?P<cloud>overcast|cloud))",
+    re.IGNORECASE,
+)
+
+
 def classify_weather(weather_text: str) -> str:
-    t = weather_text.lower()
+    # One scan collects every theme mentioned; they are then checked in priority order.
+    found = {m.lastgroup for m in _CLASSIFY_RE.finditer(weather_text)}
 
     # Strong signals first
-    if any(k in t for k in ["thunder", "storm"]):
-        return "thunder"
-    if any(k in t for k in ["snow", "sleet", "blizzard"]):
-        return "snow"
-    if any(k in t for k in ["rain", "drizzle", "shower"]):
-        return "rain"
-    if any(k in t for k in ["fog", "mist", "haze"]):
-        return "fog"
+    for theme in ("thunder", "snow", "rain", "fog"):
+        if theme in found:
+            return theme
 
     # Wind theme only when it is actually windy
     w = extract_wind_kmh(weather_text)
     if w is not None and w >= 25:  # threshold (km/h)
         return "wind"
-    if any(k in t for k in ["wind", "breez", "gust"]):
+    if "wind" in found:
         # fallback: if text explicitly says windy/breezy/gusty
         return "wind"
 
-    if any(k in t for k in ["overcast", "cloud"]):
+    if "cloud" in found:
         return "cloud"
 
     return "clear"
@@ -138,22 +227,23 @@ def is_night_utc(now_utc: dt.datetime) -> bool:
     return h < 6 or h >= 18
 
 
-def write_weather_svg(path: str, theme: str, title: str, subtitle: str, now_utc: dt.datetime) -> None:
-    """
-    Full-banner continuous animations + a top-right circular badge showing sun/moon.
-    """
-    bg = {
-        "clear":   ("#0b1020", "#1b3a7a"),
-        "cloud":   ("#0f172a", "#334155"),
-        "rain":    ("#0b1020", "#1f3b6d"),
-        "wind":    ("#071018", "#123a4a"),
-        "fog":     ("#0b1020", "#2b2b2b"),
-        "snow":    ("#0b1020", "#2b4c7e"),
-        "thunder": ("#090514", "#3b1a6b"),
-    }
-    c1, c2 = bg.get(theme, bg["cloud"])
-
-    css = """
+def _compact_svg(fragment: str) -> str:
+    # The banner is only ever rendered, never read: collapse whitespace runs and
+    # drop the gaps between tags so the committed SVG stays small.
+    return re.sub(r"\s+", " ", fragment).replace(" />", "/>").replace("> <", "><").strip()
+
+
+_BG = {
+    "clear":   ("#0b1020", "#1b3a7a"),
+    "cloud":   ("#0f172a", "#334155"),
+    "rain":    ("#0b1020", "#1f3b6d"),
+    "wind":    ("#071018", "#123a4a"),
+    "fog":     ("#0b1020", "#2b2b2b"),
+    "snow":    ("#0b1020", "#2b4c7e"),
+    "thunder": ("#090514", "#3b1a6b"),
+}
+
+_CSS = _compact_svg("""
   <style>
     .title { font: 44px system-ui, -apple-system, Segoe UI, Roboto, Arial; fill: #fff; }
     .sub   { font: 24px system-ui, -apple-system, Segoe UI, Roboto, Arial; fill: #dbeafe; opacity: .95; }
@@ -191,104 +281,72 @@ def write_weather_svg(path: str, theme: str, title: str, subtitle: str, now_utc:
     @keyframes bob { 0%,100% { transform: translateY(0px); } 50% { transform: translateY(3px); } }
     .badge { animation: bob 2.8s ease-in-out infinite; }
   </style>
-"""
+""")
 
-    def rain_tile(x_offset: int, y_offset: int, step_x: int, step_y: int, count_x: int, count_y: int) -> str:
-        lines = []
-        for ix in range(count_x):
-            for iy in range(count_y):
-                x = x_offset + ix * step_x
-                y = y_offset + iy * step_y
-                lines.append(
-                    f'<line x1="{x}" y1="{y}" x2="{x-8}" y2="{y+22}" stroke="#bcd6ff" stroke-width="2" />'
-                )
-        return "\n".join(lines)
-
-    def snow_tile(count: int, seed_x: int, seed_y: int) -> str:
-        circles = []
-        x = seed_x
-        y = seed_y
-        for i in range(count):
-            x = (x * 73 + 41) % 1200
-            y = (y * 91 + 19) % 320
-            r = 1 + ((x + y + i) % 3)
-            circles.append(f'<circle cx="{x}" cy="{y}" r="{r}" />')
-        return "\n".join(circles)
-
-    rain1 = rain_tile(30, 10, 75, 95, 20, 6)
-    rain2 = rain_tile(60, 40, 85, 90, 18, 6)
-    rain3 = rain_tile(10, 20, 65, 100, 22, 6)
-
-    wind_paths = """
+_WIND_PATHS = """
     <path d="M 60 90 C 180 40, 300 140, 420 90 S 660 140, 780 90 S 1020 140, 1140 90" />
     <path d="M 20 170 C 160 120, 280 220, 420 170 S 680 220, 820 170 S 1080 220, 1220 170" />
     <path d="M 80 250 C 220 200, 340 300, 480 250 S 740 300, 880 250 S 1140 300, 1280 250" />
 """
 
-    fog_bands = """
+_FOG_BANDS = """
     <path d="M -200 110 H 1400" />
     <path d="M -260 170 H 1360" />
     <path d="M -220 230 H 1380" />
 """
 
-    clouds = """
+_CLOUDS = """
     <ellipse cx="260" cy="150" rx="140" ry="70"/>
     <ellipse cx="360" cy="140" rx="120" ry="60"/>
     <ellipse cx="980" cy="170" rx="160" ry="80"/>
     <ellipse cx="1080" cy="160" rx="130" ry="65"/>
 """
 
-    # Weather overlay
-    overlay = ""
-    if theme == "rain":
-        overlay = f"""
-  <g class="layerSlow rainSlow">{rain1}</g>
-  <g class="layerMed rainMed">{rain2}</g>
-  <g class="layerFast rainFast">{rain3}</g>
-"""
-    elif theme == "wind":
-        overlay = f"""
-  <g class="layerSlow windSlow" fill="none" stroke="#bff3ff" stroke-width="3" stroke-linecap="round">{wind_paths}</g>
-  <g class="layerMed windMed"  fill="none" stroke="#bff3ff" stroke-width="2.5" stroke-linecap="round">{wind_paths}</g>
-  <g class="layerFast windFast" fill="none" stroke="#bff3ff" stroke-width="2" stroke-linecap="round">{wind_paths}</g>
-"""
-    elif theme == "fog":
-        overlay = f"""
-  <g class="layerSlow fogSlow" fill="none" stroke="#dbeafe" stroke-width="14" stroke-linecap="round">{fog_bands}</g>
-  <g class="layerMed fogMed"   fill="none" stroke="#dbeafe" stroke-width="10" stroke-linecap="round">{fog_bands}</g>
-  <g class="layerFast fogFast" fill="none" stroke="#dbeafe" stroke-width="8"  stroke-linecap="round">{fog_bands}</g>
-"""
-    elif theme == "snow":
-        overlay = f"""
-  <g class="layerSlow snowSlow" fill="#eaf2ff">{snow_tile(160, 17, 23)}</g>
-  <g class="layerMed snowMed"   fill="#eaf2ff">{snow_tile(140, 29, 31)}</g>
-  <g class="layerFast snowFast" fill="#eaf2ff">{snow_tile(120, 41, 37)}</g>
+
+def _rain_tile(x_offset: int, y_offset: int, step_x: int, step_y: int, count_x: int, count_y: int) -> str:
+    return "".join(
+        f'<line x1="{x}" y1="{y}" x2="{x-8}" y2="{y+22}" stroke="#bcd6ff" stroke-width="2" />'
+        for x in range(x_offset, x_offset + count_x * step_x, step_x)
+        for y in range(y_offset, y_offset + count_y * step_y, step_y)
+    )
+
+
+def _snow_flakes(count: int, seed_x: int, seed_y: int):
+    # Deterministic pseudo-random scatter: yields (x, y, r) per flake.
+    x = seed_x
+    y = seed_y
+    for i in range(count):
+        x = (x * 73 + 41) % 1200
+        y = (y * 91 + 19) % 320
+        yield x, y, 1 + ((x + y + i) % 3)
+
+
+def _snow_tile(count: int, seed_x: int, seed_y: int) -> str:
+    return "".join(f'<circle cx="{x}" cy="{y}" r="{r}" />' for x, y, r in _snow_flakes(count, seed_x, seed_y))
+
+
+# The rain and snow geometry is fixed, so their parallax layers are rendered once at import.
+_RAIN_OVERLAY = f"""
+  <g class="layerSlow rainSlow">{_rain_tile(30, 10, 75, 95, 20, 6)}</g>
+  <g class="layerMed rainMed">{_rain_tile(60, 40, 85, 90, 18, 6)}</g>
+  <g class="layerFast rainFast">{_rain_tile(10, 20, 65, 100, 22, 6)}</g>
 """
-    elif theme == "thunder":
-        overlay = """
-  <g class="flash">
-    <rect width="1200" height="320" fill="#ffffff"/>
-  </g>
-  <g opacity="0.55">
-    <polygon points="620,70 560,190 635,190 590,310 705,165 635,165" fill="#f7d34a"/>
-  </g>
+
+_SNOW_OVERLAY = f"""
+  <g class="layerSlow snowSlow" fill="#eaf2ff">{_snow_tile(160, 17, 23)}</g>
+  <g class="layerMed snowMed"   fill="#eaf2ff">{_snow_tile(140, 29, 31)}</g>
+  <g class="layerFast snowFast" fill="#eaf2ff">{_snow_tile(120, 41, 37)}</g>
 """
-    elif theme == "cloud":
-        overlay = f'<g opacity="0.35" fill="#e2e8f0">{clouds}</g>'
-    else:
-        overlay = ""  # clear handled by badge + background
-
-    # Sun/Moon badge (top-right circle)
-    night = is_night_utc(now_utc)
-    # badge base
-    badge_base = """
+
+# Sun/Moon badge (top-right circle)
+_BADGE_BASE = """
   <g class="badge">
     <circle cx="1125" cy="85" r="38" fill="rgba(0,0,0,0.28)"/>
     <circle cx="1125" cy="85" r="36" fill="rgba(255,255,255,0.06)"/>
   </g>
 """
-    # sun icon
-    sun_icon = """
+
+_SUN_ICON = """
   <g class="badge">
     <circle cx="1125" cy="85" r="14" fill="#ffd36a"/>
     <g stroke="#ffd36a" stroke-width="3" stroke-linecap="round" opacity="0.95">
@@ -303,104 +361,187 @@ def write_weather_svg(path: str, theme: str, title: str, subtitle: str, now_utc:
     </g>
   </g>
 """
-    # moon icon (crescent)
-    moon_icon = """
+
+# Crescent moon for night-time runs.
+_MOON_ICON = """
   <g class="badge">
     <circle cx="1125" cy="85" r="16" fill="#dbeafe"/>
     <circle cx="1132" cy="80" r="16" fill="rgba(0,0,0,0.28)"/>
   </g>
 """
 
-    badge = badge_base + (moon_icon if night else sun_icon)
-
-    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="320" viewBox="0 0 1200 320">
-  <defs>
-    <linearGradient id="g" x1="0" y1="0" x2="1" y2="1">
-      <stop offset="0" stop-color="{c1}"/>
-      <stop offset="1" stop-color="{c2}"/>
-    </linearGradient>
-    <filter id="shadow" x="-20%" y="-20%" width="140%" height="140%">
-      <feDropShadow dx="0" dy="6" stdDeviation="10" flood-color="#000" flood-opacity="0.35"/>
-    </filter>
-  </defs>
-{css}
-
-  <rect width="1200" height="320" rx="22" fill="url(#g)"/>
-  {overlay}
-
-  {badge}
-
-  <g filter="url(#shadow)">
-    <rect x="56" y="60" width="1088" height="200" rx="18" class="card"/>
-    <text x="96" y="135" class="title">{escape_svg_text(title)}</text>
-    <text x="96" y="195" class="sub">{escape_svg_text(subtitle)}</text>
+
+_DAY_BADGE = _compact_svg(_BADGE_BASE + _SUN_ICON)
+_NIGHT_BADGE = _compact_svg(_BADGE_BASE + _MOON_ICON)
+
+# Per-theme weather overlay; "clear" (and any unknown theme) relies on badge + background only.
+_OVERLAYS = {theme: _compact_svg(fragment) for theme, fragment in {
+    "rain": _RAIN_OVERLAY,
+    "wind": f"""
+  <g class="layerSlow windSlow" fill="none" stroke="#bff3ff" stroke-width="3" stroke-linecap="round">{_WIND_PATHS}</g>
+  <g class="layerMed windMed"  fill="none" stroke="#bff3ff" stroke-width="2.5" stroke-linecap="round">{_WIND_PATHS}</g>
+  <g class="layerFast windFast" fill="none" stroke="#bff3ff" stroke-width="2" stroke-linecap="round">{_WIND_PATHS}</g>
+""",
+    "fog": f"""
+  <g class="layerSlow fogSlow" fill="none" stroke="#dbeafe" stroke-width="14" stroke-linecap="round">{_FOG_BANDS}</g>
+  <g class="layerMed fogMed"   fill="none" stroke="#dbeafe" stroke-width="10" stroke-linecap="round">{_FOG_BANDS}</g>
+  <g class="layerFast fogFast" fill="none" stroke="#dbeafe" stroke-width="8"  stroke-linecap="round">{_FOG_BANDS}</g>
+""",
+    "snow": _SNOW_OVERLAY,
+    "thunder": """
+  <g class="flash">
+    <rect width="1200" height="320" fill="#ffffff"/>
   </g>
-</svg>
-"""
+  <g opacity="0.55">
+    <polygon points="620,70 560,190 635,190 590,310 705,165 635,165" fill="#f7d34a"/>
+  </g>
+""",
+    "cloud": f'<g opacity="0.35" fill="#e2e8f0">{_CLOUDS}</g>',
+    "clear": "",
+}.items()}
+
+
+def write_weather_svg(path: str, theme: str, title: str, subtitle: str, now_utc: dt.datetime) -> bool:
+    """
+    Full-banner continuous animations + a top-right circular badge showing sun/moon.
+    """
+    c1, c2 = _BG.get(theme, _BG["cloud"])
+
+    overlay = _OVERLAYS.get(theme, "")
+    badge = _NIGHT_BADGE if is_night_utc(now_utc) else _DAY_BADGE
+
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="320" viewBox="0 0 1200 320">'
+        '<defs>'
+        '<linearGradient id="g" x1="0" y1="0" x2="1" y2="1">'
+        f'<stop offset="0" stop-color="{c1}"/>'
+        f'<stop offset="1" stop-color="{c2}"/>'
+        '</linearGradient>'
+        '<filter id="shadow" x="-20%" y="-20%" width="140%" height="140%">'
+        '<feDropShadow dx="0" dy="6" stdDeviation="10" flood-color="#000" flood-opacity="0.35"/>'
+        '</filter>'
+        '</defs>'
+        f'{_CSS}'
+        '<rect width="1200" height="320" rx="22" fill="url(#g)"/>'
+        f'{overlay}{badge}'
+        '<g filter="url(#shadow)">'
+        '<rect x="56" y="60" width="1088" height="200" rx="18" class="card"/>'
+        f'<text x="96" y="135" class="title">{escape_svg_text(title)}</text>'
+        f'<text x="96" y="195" class="sub">{escape_svg_text(subtitle)}</text>'
+        '</g>'
+        '</svg>\n'
+    )
+    data = svg.encode("utf-8")
+
+    # Leave the file (and its mtime) alone when the rendered banner is identical.
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    with open(path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(svg)
+    write_bytes_atomic(path, data)
+    return True
 
 
-def extract_block(readme: str) -> str:
-    if START not in readme or END not in readme:
+def find_block(readme: str) -> tuple[int, int]:
+    # Offsets of START and END, located once and shared by extract_block and the splice.
+    s = readme.find(START)
+    e = readme.find(END, s) if s != -1 else -1
+    if s == -1 or e == -1:
         raise SystemExit("Weather markers not found in README.md")
-    m = re.search(rf"{re.escape(START)}\n(.*)\n{re.escape(END)}", readme, flags=re.DOTALL)
-    if not m:
-        return ""
-    return m.group(1).strip()
+    return s, e
+
+
+def extract_block(readme: str, s: int, e: int) -> str:
+    return readme[s + len(START):e].strip()
 
 
 def build_new_block(existing_block: str, banner_line: str, new_line: str, now_date: dt.date) -> str:
-    cutoff = now_date - dt.timedelta(days=KEEP_DAYS - 1)  # inclusive
+    # ISO dates order correctly as strings, so entries are filtered without parsing them.
+    cutoff = (now_date - dt.timedelta(days=KEEP_DAYS - 1)).isoformat()  # inclusive
+    header = f"### Dublin weather (last {KEEP_DAYS} days)"
+    banner = banner_line.strip()
 
-    kept_lines = []
+    block_lines = [banner_line, "", header, new_line]
     for line in existing_block.splitlines():
         line = line.rstrip()
+        stripped = line.lstrip()
 
-        if line.strip() == banner_line.strip():
+        # Blank lines, the banner, the header and a repeat of the new entry are re-emitted above.
+        if not stripped or stripped == banner or stripped == header or line == new_line:
             continue
 
-        mm = LINE_RE.match(line)
-        if not mm:
-            if line.strip():
-                kept_lines.append(line)
-            continue
+        # Entries have a fixed layout (see LINE_RE), so check the separators at
+        # their known offsets and compare the date slice instead of matching a regex.
+        is_entry = (
+            line.startswith("- ") and line[12:13] == " " and line[15:16] == ":" and line[18:25] == " UTC — "
+            and line[2:6].isdigit() and line[6:7] == "-" and line[7:9].isdigit() and line[9:10] == "-"
+            and line[10:12].isdigit()
+        )
+        if not is_entry or line[2:12] >= cutoff:
+            block_lines.append(line)
 
-        d = dt.date.fromisoformat(mm.group(1))
-        if d >= cutoff:
-            kept_lines.append(line)
+    # Every appended line is non-blank with trailing whitespace removed, so one join is the whole block.
+    return "\n".join(block_lines)
 
-    header = f"### Dublin weather (last {KEEP_DAYS} days)"
-    kept_lines = [ln for ln in kept_lines if ln != header]
 
-    block_lines = [banner_line, "", header, new_line]
-    rest = [ln for ln in kept_lines if ln != new_line and ln.strip() != header]
-    block_lines.extend(rest)
+def current_weather() -> tuple[str, str]:
+    """
+    Returns (weather text, banner theme), falling back to a placeholder when
+    every provider fails.
+    """
+    try:
+        weather = fetch_weather()
+        return weather, classify_weather(weather)
+    except Exception:
+        return FETCH_UNAVAILABLE, "cloud"
 
-    out = "\n".join(block_lines).strip() + "\n"
-    return out.strip()
+
+def _peek_block_head(readme_path: str) -> str:
+    """
+    Returns the start of the weather block, reading only the head of README.md.
+    The newest entries sit right under the header, so this is enough to find them.
+    """
+    with open(readme_path, "r", encoding="utf-8") as f:
+        head = f.read(4096)
+    s = head.find(START)
+    if s == -1:
+        return ""
+    head = head[s + len(START):]
+    e = head.find(END)
+    return head if e == -1 else head[:e]
+
+
+def needs_refresh(existing_block: str, now_dt: dt.datetime, min_interval: dt.timedelta = MIN_REFRESH_INTERVAL) -> bool:
+    """
+    False when the newest successful entry in the block is younger than min_interval.
+    """
+    for line in existing_block.splitlines():
+        mm = LINE_RE.match(line.rstrip())
+        if not mm or mm.group(3) == FETCH_UNAVAILABLE:
+            continue
+        try:
+            ts = dt.datetime.strptime(f"{mm.group(1)} {mm.group(2)}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            continue
+        return now_dt - ts.replace(tzinfo=dt.timezone.utc) >= min_interval
+    return True
 
 
-def update_readme(readme_path: str) -> bool:
+def update_readme(readme_path: str, now_dt: dt.datetime, weather: str, theme: str) -> bool:
     with open(readme_path, "r", encoding="utf-8") as f:
         original = f.read()
+    s, e = find_block(original)
 
-    now_dt = dt.datetime.now(dt.timezone.utc)
     now_stamp = now_dt.strftime("%Y-%m-%d %H:%M UTC")
     now_date = now_dt.date()
-
-    try:
-        weather = fetch_weather()
-        entry = f"- {now_stamp} — {weather}"
-        theme = classify_weather(weather)
-    except Exception:
-        weather = "⚠️ Weather fetch unavailable."
-        entry = f"- {now_stamp} — {weather}"
-        theme = "cloud"
+    entry = f"- {now_stamp} — {weather}"
 
     banner_path = os.path.join(os.getcwd(), "assets", "dublin-weather.svg")
-    write_weather_svg(
+    banner_changed = write_weather_svg(
         path=banner_path,
         theme=theme,
         title="Dublin Weather",
@@ -410,19 +551,16 @@ def update_readme(readme_path: str) -> bool:
 
     banner_line = '<img src="assets/dublin-weather.svg" width="100%" alt="Dublin weather banner" />'
 
-    existing_block = extract_block(original)
+    existing_block = extract_block(original, s, e)
     new_block = build_new_block(existing_block, banner_line, entry, now_date)
 
-    pattern = re.compile(rf"{re.escape(START)}.*?{re.escape(END)}", flags=re.DOTALL)
-    replacement = f"{START}\n{new_block}\n{END}"
-    updated = pattern.sub(replacement, original)
+    updated = original[:s] + START + "\n" + new_block + "\n" + END + original[e + len(END):]
 
     if updated == original:
-        print("No changes needed.")
-        return False
+        print("Banner updated." if banner_changed else "No changes needed.")
+        return banner_changed
 
-    with open(readme_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(updated)
+    write_bytes_atomic(readme_path, updated.encode("utf-8"))
 
     print("README.md updated.")
     return True
@@ -433,7 +571,16 @@ def main() -> None:
     if not os.path.exists(readme_path):
         raise SystemExit("README.md not found in repo root")
 
-    update_readme(readme_path)
+    now_dt = dt.datetime.now(dt.timezone.utc)
+
+    # The network round-trips dominate the run time; skip them (and the
+    # whole README rewrite) when the last reading is still fresh.
+    if not needs_refresh(_peek_block_head(readme_path), now_dt):
+        print("Latest entry is still fresh; no changes needed.")
+        return
+
+    weather, theme = current_weather()
+    update_readme(readme_path, now_dt, weather, theme)
 
 
 if __name__ == "__main__":